@@ -1,56 +1,310 @@
 #!/usr/bin/env python3
 """Minimal CLI that delegates to Claude Code for paper search and formatting."""
 
+from __future__ import annotations
+
+import argparse
+import functools
+import hashlib
 import json
+import os
 import re
+import shutil
 import subprocess
 import sys
 from pathlib import Path
-from typing import Optional, List
+from typing import TYPE_CHECKING, Optional, List, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from rich.progress import Progress, TaskID
+
+
+
+def _style(text: str, code: str) -> str:
+    """Wrap text in an ANSI SGR code when stdout is a terminal."""
+    if not sys.stdout.isatty():
+        return text
+    return f"\x1b[{code}m{text}\x1b[0m"
+
+
+def _red(text: str) -> str:
+    return _style(text, "31")
+
+
+def _green(text: str) -> str:
+    return _style(text, "32")
+
+
+def _yellow(text: str) -> str:
+    return _style(text, "33")
+
+
+def _blue(text: str) -> str:
+    return _style(text, "34")
+
 
-import typer
-from rich.console import Console
-from rich.prompt import Prompt, Confirm
-from rich.progress import Progress, SpinnerColumn, TextColumn
+def _bold(text: str) -> str:
+    return _style(text, "1")
 
-app = typer.Typer(help="Turn natural-language paper descriptions into curated citations")
-console = Console()
 
-# Simple state file to track current session (in working directory)
-STATE_FILE = Path.cwd() / ".vc_state.json"
+def _dim(text: str) -> str:
+    return _style(text, "2")
+
+
+# Code fences (```lang, or a closing ```) anywhere in Claude's response, with
+# the rest of their line; BibTeX entries live in ```bibtex or bare ``` blocks.
+# Responses are scanned as raw bytes.
+_FENCE_RE = re.compile(rb'```([A-Za-z]*)([^`\n]*)')
+_BIBTEX_FENCE_LANGS = (b"", b"bibtex")
+
+# Claude Code tools that must be allowed for paper search
+_SEARCH_TOOLS = ("WebSearch", "WebFetch")
+
+# Bytes read from Claude Code's stdout per read call
+_READ_CHUNK_SIZE = 64 * 1024
+
+# Vibes sent per Claude Code call, and how many calls may run at once
+_SEARCH_BATCH_SIZE = 5
+_MAX_CONCURRENT_SEARCHES = 4
+
+# "### VIBE <n>" section headers in a batched search response
+_VIBE_HEADER_RE = re.compile(rb'^[ \t]*#+[ \t]*VIBE[ \t]+(\d+)\b', re.MULTILINE | re.IGNORECASE)
+
+
+# Process-local copy of the state file, keyed by its (mtime_ns, size)
+_state_cache: Optional[dict] = None
+_state_key: Optional[Tuple[int, int]] = None
+
+
+def _json_loads(data: bytes) -> dict:
+    """Parse JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: dict) -> bytes:
+    """Serialize to indented JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
+
+def _atomic_write_bytes(path: Path, payload: bytes) -> None:
+    """Write payload to path via a temp file and os.replace, so readers never see a partial file."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        try:
+            view = memoryview(payload)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        # path only ever appears fully written and synced
+        os.replace(tmp_path, path)
+    except BaseException:
+        # Don't leave a partial temp file behind (e.g. on ENOSPC)
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+@functools.cache
+def _state_file() -> Path:
+    """Simple state file to track current session (in working directory)."""
+    return Path.cwd() / ".vc_state.json"
+
+
+@functools.cache
+def _raw_cache_dir() -> Path:
+    """Directory holding raw Claude responses, kept out of the state file."""
+    return Path.cwd() / ".vc_cache"
+
+
+def store_raw_results(raw: bytes) -> str:
+    """Store a raw Claude response under its SHA-256 and return the hash."""
+    digest = hashlib.sha256(raw).hexdigest()
+    path = _raw_cache_dir() / f"{digest}.txt"
+    if not path.exists():
+        _raw_cache_dir().mkdir(exist_ok=True)
+        _atomic_write_bytes(path, raw)
+    return digest
 
 
 def load_state() -> dict:
     """Load current session state."""
-    if STATE_FILE.exists():
-        return json.loads(STATE_FILE.read_text())
-    return {"vibes": [], "current_bib": None}
+    global _state_cache, _state_key
+    try:
+        st = _state_file().stat()
+    except FileNotFoundError:
+        return {"vibes": [], "current_bib": None}
+    key = (st.st_mtime_ns, st.st_size)
+    if _state_cache is None or _state_key != key:
+        _state_cache = _json_loads(_state_file().read_bytes())
+        _state_key = key
+    return _state_cache
 
 
 def save_state(state: dict) -> None:
     """Save current session state."""
-    STATE_FILE.write_text(json.dumps(state, indent=2))
+    global _state_cache, _state_key
+    _atomic_write_bytes(_state_file(), _json_dumps(state))
+    st = _state_file().stat()
+    _state_cache = state
+    _state_key = (st.st_mtime_ns, st.st_size)
+
+
+def load_raw_results(vibe: dict) -> bytes:
+    """Return a vibe's raw Claude response, or b"" if it has none."""
+    if vibe.get("raw_results_hash"):
+        try:
+            return (_raw_cache_dir() / f"{vibe['raw_results_hash']}.txt").read_bytes()
+        except FileNotFoundError:
+            return b""
+    # Older state files kept the response inline
+    raw: str = vibe.get("raw_results", "")
+    return raw.encode()
 
 
-def extract_bibtex_from_response(response: str) -> List[str]:
+def read_raw_preview(vibe: dict, limit: int) -> Tuple[str, bool]:
+    """Return up to limit characters of a vibe's raw response, and whether there is more.
+
+    Cached responses are read only as far as the preview needs.
+    """
+    if vibe.get("raw_results_hash"):
+        try:
+            path = _raw_cache_dir() / f"{vibe['raw_results_hash']}.txt"
+            with open(path, encoding="utf-8", errors="replace") as f:
+                head = f.read(limit + 1)
+        except FileNotFoundError:
+            return "", False
+    else:
+        head = vibe.get("raw_results", "")[:limit + 1]
+    return head[:limit], len(head) > limit
+
+
+def extract_bibtex_from_response(response: Union[str, bytes]) -> List[str]:
     """Extract BibTeX entries from code blocks in Claude's response."""
-    # Look for ```bibtex ... ``` code blocks
-    bibtex_pattern = r'```(?:bibtex)?\s*\n(.*?)\n```'
-    matches = re.findall(bibtex_pattern, response, re.DOTALL | re.IGNORECASE)
-    
-    # Clean up the matches and filter out empty ones
+    if isinstance(response, str):
+        response = response.encode()
+    return list(_extract_bibtex_cached(response))
+
+
+@functools.lru_cache(maxsize=128)
+def _extract_bibtex_cached(response: bytes) -> Tuple[str, ...]:
+    # Cached as a tuple so callers can't mutate the memoized result
     bibtex_entries = []
-    for match in matches:
-        cleaned = match.strip()
-        if cleaned and '@' in cleaned:  # Basic check for BibTeX entry
-            bibtex_entries.append(cleaned)
+    # Walk fences in one pass, pairing each opening fence with the next fence
+    # (which closes it, even with text after it) and slicing the block body
+    # straight out of the response
+    opening: Optional[re.Match] = None
+    for fence in _FENCE_RE.finditer(response):
+        if opening is None:
+            opening = fence
+        else:
+            # Like the original pattern, a BibTeX fence has nothing but
+            # whitespace after its language tag
+            is_bibtex = (
+                opening.group(1).lower() in _BIBTEX_FENCE_LANGS
+                and not opening.group(2).strip()
+            )
+            if is_bibtex:
+                cleaned = response[opening.end():fence.start()].strip()
+                if cleaned and b'@' in cleaned:  # Basic check for BibTeX entry
+                    bibtex_entries.append(cleaned.decode("utf-8", "replace"))
+            opening = None
+    
+    return tuple(bibtex_entries)
+
+
+def build_search_prompt(descriptions: List[str]) -> str:
+    """Build a single prompt asking for one paper per description."""
+    vibes = "\n".join(
+        f"### VIBE {i}: {description}" for i, description in enumerate(descriptions, 1)
+    )
+    return f"""Please search for academic papers matching each of the following descriptions:
+
+{vibes}
+
+For EACH description, find ONLY ONE most relevant paper and return it in BibTeX format. IMPORTANT: When choosing between multiple versions of the same paper, prioritize the conference/journal publication over the arXiv version. Include DOI when available.
+
+Answer the descriptions in order. Start each answer with its header line exactly as given above (e.g. "### VIBE 1") and put its BibTeX entry inside ```bibtex ``` code blocks right below it."""
+
+
+def split_batch_response(response: bytes, count: int) -> List[bytes]:
+    """Split a batched response into per-vibe sections using the "### VIBE <n>" headers.
+
+    A header can appear more than once (e.g. Claude restates the list before
+    answering), so every section under the same header is kept. Vibes without
+    a matching header get an empty section.
+    """
+    headers = list(_VIBE_HEADER_RE.finditer(response))
+    if not headers:
+        sections = [b""] * count
+        if count == 1:
+            sections[0] = response
+        return sections
+    
+    parts: List[List[bytes]] = [[] for _ in range(count)]
+    for header, next_header in zip(headers, headers[1:] + [None]):
+        index = int(header.group(1)) - 1
+        if 0 <= index < count:
+            end = next_header.start() if next_header else len(response)
+            parts[index].append(response[header.start():end].strip())
+    return [b"\n\n".join(part) for part in parts]
+
+
+def assign_batch_entries(response: bytes, count: int) -> List[Tuple[bytes, List[str]]]:
+    """Assign the BibTeX entries of a batched response to its vibes, in prompt order.
+
+    Returns a (raw section, entries) pair per vibe. Each vibe was asked for
+    exactly one paper, so a section with no entries or several entries gets
+    none. If the per-section split doesn't give every vibe exactly one entry
+    but the whole response holds exactly one entry per vibe (e.g. headers
+    were dropped or only restated up front), entries are assigned in order.
+    """
+    sections = split_batch_response(response, count)
+    section_entries = [extract_bibtex_from_response(section) for section in sections]
+    if all(len(entries) == 1 for entries in section_entries):
+        return list(zip(sections, section_entries))
+    
+    # Only reached when the split is implausible. The full batch response is
+    # scanned once, so bypass the cache rather than pin it there.
+    all_entries = _extract_bibtex_cached.__wrapped__(response)
+    if len(all_entries) == count:
+        return [(f"```bibtex\n{entry}\n```".encode(), [entry]) for entry in all_entries]
     
-    return bibtex_entries
+    return [
+        (section, entries if len(entries) == 1 else [])
+        for section, entries in zip(sections, section_entries)
+    ]
+
+
+def _settings_signature(settings_file: Path) -> str:
+    """Identify a settings file revision by its mtime and size."""
+    st = settings_file.stat()
+    return f"{st.st_mtime_ns} {st.st_size}"
 
 
 def check_web_search_settings() -> bool:
     """Check if WebSearch and WebFetch tools are enabled in .claude/settings.local.json."""
     settings_file = Path.cwd() / ".claude" / "settings.local.json"
+    # Records the settings revision that was last verified, so unchanged
+    # settings don't have to be parsed again
+    marker_file = settings_file.with_name(".vc_settings_ok")
+    
+    try:
+        if marker_file.read_text() == _settings_signature(settings_file):
+            return True
+    except FileNotFoundError:
+        pass
     
     try:
         if not settings_file.exists():
@@ -59,38 +313,31 @@ def check_web_search_settings() -> bool:
             # Create settings file with WebSearch and WebFetch enabled
             settings = {
                 "permissions": {
-                    "allow": ["WebSearch", "WebFetch"],
+                    "allow": list(_SEARCH_TOOLS),
                     "deny": [],
                     "ask": []
                 }
             }
-            settings_file.write_text(json.dumps(settings, indent=2))
-            return True
-        
-        # Read existing settings
-        settings = json.loads(settings_file.read_text())
-        allowed_tools = settings.get("permissions", {}).get("allow", [])
-        
-        # Check if both WebSearch and WebFetch are in the allow list
-        has_websearch = "WebSearch" in allowed_tools
-        has_webfetch = "WebFetch" in allowed_tools
-        
-        if not has_websearch or not has_webfetch:
-            # Add missing tools
-            if not has_websearch:
-                allowed_tools.append("WebSearch")
-            if not has_webfetch:
-                allowed_tools.append("WebFetch")
+            settings_file.write_bytes(_json_dumps(settings))
+        else:
+            # Read existing settings
+            settings = _json_loads(settings_file.read_bytes())
+            allowed_tools = settings.get("permissions", {}).get("allow", [])
             
-            # Update and save the file
-            settings["permissions"]["allow"] = allowed_tools
-            settings_file.write_text(json.dumps(settings, indent=2))
-            return True
+            # Add whichever of WebSearch and WebFetch is missing from the allow list,
+            # and only rewrite the file if something was actually added
+            allowed = set(allowed_tools)
+            missing = [tool for tool in _SEARCH_TOOLS if tool not in allowed]
+            if missing:
+                settings.setdefault("permissions", {})["allow"] = allowed_tools + missing
+                # Rewrite in place so the user's file keeps its mode, inode and symlinks
+                settings_file.write_bytes(_json_dumps(settings))
         
+        marker_file.write_text(_settings_signature(settings_file))
         return True
         
     except (json.JSONDecodeError, KeyError, FileNotFoundError) as e:
-        console.print(f"[red]Error reading Claude settings: {e}[/red]")
+        print(_red(f"Error reading Claude settings: {e}"))
         return False
 
 
@@ -99,55 +346,116 @@ def enable_web_search_with_consent() -> bool:
     # The check_web_search_settings function now automatically creates or updates
     # the settings file to include WebSearch and WebFetch tools
     if check_web_search_settings():
-        console.print("[green]WebSearch and WebFetch tools are enabled![/green]")
+        print(_green("WebSearch and WebFetch tools are enabled!"))
         return True
     else:
-        console.print("[red]Failed to configure search tools in Claude settings.[/red]")
-        console.print("[yellow]Paper discovery may be limited without search tools.[/yellow]")
+        print(_red("Failed to configure search tools in Claude settings."))
+        print(_yellow("Paper discovery may be limited without search tools."))
         return False
 
 
-def call_claude_code(prompt: str) -> str:
-    """Call Claude Code with a search prompt and return results."""
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
-        task = progress.add_task("Calling Claude Code...", total=None)
-        
-        try:
-            # Enhanced prompt with search tools instructions
-            enhanced_prompt = f"""You have access to search tools including WebSearch and WebFetch. Use these tools to search for academic papers.
+async def call_claude_code(
+    prompt: str, progress: Optional[Progress] = None, task: Optional[TaskID] = None
+) -> bytes:
+    """Call Claude Code with a search prompt and return its raw output.
+
+    The output stays undecoded bytes; BibTeX entries are extracted from it
+    by the caller. Progress is reported on the given task of a shared Rich
+    progress display, if any.
+    """
+    import asyncio
+    
+    def update(status: str) -> None:
+        if progress is not None and task is not None:
+            progress.update(task, description=status)
+    
+    try:
+        # Enhanced prompt with search tools instructions
+        enhanced_prompt = f"""You have access to search tools including WebSearch and WebFetch. Use these tools to search for academic papers.
 
 {prompt}
 
 Please use your available search tools to find relevant academic papers and format them as BibTeX entries. Be thorough in your search and provide high-quality citations."""
 
-            result = subprocess.run(
-                ["claude", "--"],  # Assumes claude CLI is available
-                input=enhanced_prompt,
-                text=True,
-                capture_output=True,
-                check=True,
+        proc = await asyncio.create_subprocess_exec(
+            "claude", "--",  # Assumes claude CLI is available
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        assert proc.stdin is not None and proc.stdout is not None and proc.stderr is not None
+        # Drain stderr alongside stdout so a chatty child can't block on a full pipe
+        stderr_task = asyncio.ensure_future(proc.stderr.read())
+        try:
+            proc.stdin.write(enhanced_prompt.encode())
+            await proc.stdin.drain()
+            proc.stdin.close()
+        except (BrokenPipeError, ConnectionResetError):
+            # claude exited without reading the prompt (e.g. not logged in);
+            # its exit status and stderr below say why
+            pass
+
+        # Read fixed-size chunks rather than lines, so no single output line
+        # can exceed the stream reader's line limit
+        chunks: List[bytes] = []
+        while True:
+            chunk = await proc.stdout.read(_READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            chunks.append(chunk)
+
+        stderr = (await stderr_task).decode("utf-8", "replace")
+        returncode = await proc.wait()
+        if returncode:
+            raise subprocess.CalledProcessError(
+                returncode, ["claude", "--"], b"".join(chunks), stderr
             )
-            progress.update(task, description="Claude Code completed successfully")
-            return result.stdout
-        except subprocess.CalledProcessError as e:
-            progress.update(task, description=f"Error: {e}")
-            console.print(f"[red]Error calling Claude Code: {e}[/red]")
-            console.print(f"[red]Error output: {e.stderr}[/red]")
-            return ""
-        except FileNotFoundError:
-            progress.update(task, description="Claude Code CLI not found")
-            console.print("[red]Claude Code CLI not found. Please install it first.[/red]")
-            return ""
+        update("Claude Code completed successfully")
+        return b"".join(chunks)
+    except subprocess.CalledProcessError as e:
+        update(f"Error: {e}")
+        # Plain diagnostics go straight to stderr in a single write
+        sys.stderr.write(f"Error calling Claude Code: {e}\nError output: {e.stderr.rstrip()}\n")
+        return b""
+    except FileNotFoundError:
+        update("Claude Code CLI not found")
+        sys.stderr.write("Claude Code CLI not found. Please install it first.\n")
+        return b""
+
+
+async def _search_batches(batches: List[List[str]]) -> List[bytes]:
+    """Run one Claude Code call per batch of vibes, a few at a time."""
+    import asyncio
+    
+    semaphore = asyncio.Semaphore(_MAX_CONCURRENT_SEARCHES)
+    
+    async def run(batch: List[str], progress: Optional[Progress]) -> bytes:
+        async with semaphore:
+            task = None
+            if progress is not None:
+                task = progress.add_task(f"Calling Claude Code for {len(batch)} vibes...", total=None)
+            try:
+                return await call_claude_code(build_search_prompt(batch), progress, task)
+            except Exception as e:
+                # One failed batch shouldn't throw away the others' results
+                sys.stderr.write(f"Error calling Claude Code: {e}\n")
+                return b""
+    
+    if not sys.stdout.isatty():
+        # Nobody is watching a spinner when output is piped or redirected
+        return await asyncio.gather(*(run(batch, None) for batch in batches))
+    
+    # Rich's progress machinery is only needed here, so keep it off the import path
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+    ) as progress:
+        return await asyncio.gather(*(run(batch, progress) for batch in batches))
 
 
-@app.command()
-def init(
-    bib: Optional[str] = typer.Option(None, "--bib", help="BibTeX file path")
-) -> None:
+def init(bib: Optional[str] = None) -> None:
     """Initialize or continue a bibliography project."""
     state = load_state()
     
@@ -155,156 +463,222 @@ def init(
         bib_path = Path(bib)
         if not bib_path.exists():
             bib_path.touch()
-            console.print(f"[green]Created new bibliography file: {bib}[/green]")
+            print(_green(f"Created new bibliography file: {bib}"))
         state["current_bib"] = str(bib_path.absolute())
     else:
         state["current_bib"] = str(Path("refs.bib").absolute())
         Path("refs.bib").touch()
-        console.print("[green]Created refs.bib[/green]")
+        print(_green("Created refs.bib"))
     
     save_state(state)
-    console.print(f"[blue]Project initialized with bibliography: {state['current_bib']}[/blue]")
+    print(_blue(f"Project initialized with bibliography: {state['current_bib']}"))
 
 
-@app.command(context_settings={"allow_extra_args": True, "ignore_unknown_options": True})
-def add(
-    ctx: typer.Context
-) -> None:
+def add(description: List[str]) -> None:
     """Add a paper vibe (natural language description).
     
     Usage: vc add -- "description of papers you want"
     """
-    # Get the description from command line args after --
-    args = ctx.args
+    # argparse keeps a leading "--" in the remainder
+    args = description[1:] if description[:1] == ["--"] else description
     if not args:
-        console.print("[red]Please provide a description after --[/red]")
-        console.print("[yellow]Usage: vc add -- \"your paper description here\"[/yellow]")
+        print(_red("Please provide a description after --"))
+        print(_yellow("Usage: vc add -- \"your paper description here\""))
         return
     
-    description = " ".join(args)
+    text = " ".join(args)
     state = load_state()
     
     vibe = {
-        "description": description,
+        "description": text,
         "results": None
     }
     
     state["vibes"].append(vibe)
     save_state(state)
     
-    console.print(f"[green]Added vibe: {description}[/green]")
+    print(_green(f"Added vibe: {text}"))
 
 
-@app.command()
 def search() -> None:
     """Search for papers using Claude Code."""
     state = load_state()
     
     if not state["vibes"]:
-        console.print("[yellow]No vibes added yet. Use 'vc add -- \"description\"' first.[/yellow]")
+        print(_yellow("No vibes added yet. Use 'vc add -- \"description\"' first."))
+        return
+    
+    vibes = state["vibes"]
+    pending = [i for i, vibe in enumerate(vibes) if not vibe["results"]]
+    if not pending:
+        print(_green("All vibes already have results."))
         return
     
     # Check and potentially enable web search
     enable_web_search_with_consent()
     
-    for i, vibe in enumerate(state["vibes"]):
-        if vibe["results"]:
-            continue  # Skip already processed vibes
-            
-        console.print(f"[blue]Searching for: {vibe['description']}[/blue]")
-        
-        # Create a focused prompt for Claude Code
-        search_prompt = f"""Please search for academic papers matching this description: "{vibe['description']}"
-
-Please find ONLY ONE most relevant paper and return it in BibTeX format. IMPORTANT: When choosing between multiple versions of the same paper, prioritize the conference/journal publication over the arXiv version. Include DOI when available. Format your response with the BibTeX entry inside ```bibtex ``` code blocks."""
-
-        results = call_claude_code(search_prompt)
+    for i in pending:
+        print(_blue(f"Searching for: {vibes[i]['description']}"))
+    
+    # asyncio is only needed for searching, so keep it off the import path of other commands
+    import asyncio
+    
+    # Send pending vibes in batches, with the batches' Claude Code calls running concurrently
+    batches = [
+        pending[i:i + _SEARCH_BATCH_SIZE] for i in range(0, len(pending), _SEARCH_BATCH_SIZE)
+    ]
+    batch_results = asyncio.run(
+        _search_batches([[vibes[i]["description"] for i in batch] for batch in batches])
+    )
+    
+    for batch, results in zip(batches, batch_results):
+        if not results:
+            print(_red("Search failed"))
+            continue
         
-        if results:
-            # Store the raw response
-            vibe["raw_results"] = results
+        for i, (section, entries) in zip(batch, assign_batch_entries(results, len(batch))):
+            vibe = vibes[i]
+            if not section:
+                print(_red(f"No result returned for: {vibe['description']}"))
+                continue
             
-            # Extract and parse BibTeX entries
-            bibtex_entries = extract_bibtex_from_response(results)
-            if bibtex_entries:
-                vibe["results"] = "\n\n".join(bibtex_entries)
-                console.print(f"[green]Search completed! Found {len(bibtex_entries)} BibTeX entries.[/green]")
+            # Store the raw response out of band, keyed by its content hash
+            vibe.pop("raw_results", None)
+            vibe["raw_results_hash"] = store_raw_results(section)
+            
+            if entries:
+                vibe["bibtex_list"] = entries
+                vibe["results"] = "\n\n".join(entries)
+                print(_green(f"Found {len(entries)} BibTeX entries for: {vibe['description']}"))
             else:
-                # Fallback to raw results if no BibTeX blocks found
-                vibe["results"] = results
-                console.print("[yellow]Search completed but no BibTeX code blocks found. Using raw response.[/yellow]")
-        else:
-            console.print("[red]Search failed[/red]")
+                # Leave the vibe pending so the next search retries it
+                print(_yellow(f"No single BibTeX entry found for: {vibe['description']}. It will be retried on the next search."))
     
     save_state(state)
 
 
-@app.command()
-def export(
-    bib: Optional[str] = typer.Option(None, "--bib", help="Output BibTeX file"),
-    format: str = typer.Option("bibtex", "--format", help="Output format (bibtex only for now)")
-) -> None:
+def export(bib: Optional[str] = None, format: str = "bibtex") -> None:
     """Export collected citations."""
     state = load_state()
     
     output_file = bib or state.get("current_bib") or "refs.bib"
     
-    all_results = []
-    for vibe in state["vibes"]:
-        if vibe["results"]:
-            all_results.append(vibe["results"])
+    all_results = [vibe["results"] for vibe in state["vibes"] if vibe["results"]]
     
     if not all_results:
-        console.print("[yellow]No search results to export. Run 'vc search' first.[/yellow]")
+        print(_yellow("No search results to export. Run 'vc search' first."))
         return
     
-    # Combine all results
-    combined_results = "\n\n".join(all_results)
-    
-    # Write to file
-    Path(output_file).write_text(combined_results)
-    console.print(f"[green]Exported to {output_file}[/green]")
+    # Stream entries straight to the file rather than joining them in memory first
+    with open(output_file, "wb", buffering=1024 * 1024) as f:
+        for i, results in enumerate(all_results):
+            if i:
+                f.write(b"\n\n")
+            f.write(results.encode())
+    print(_green(f"Exported to {output_file}"))
 
 
-@app.command()
 def ls() -> None:
     """Show currently recorded status."""
     state = load_state()
     
     if not state["vibes"]:
-        console.print("[yellow]No vibes recorded[/yellow]")
+        print(_yellow("No vibes recorded"))
         return
     
     for i, vibe in enumerate(state["vibes"]):
-        console.print(f"\n[blue]Vibe {i+1}:[/blue] {vibe['description']}")
+        print(f"\n{_blue(f'Vibe {i+1}:')} {vibe['description']}")
         
         if vibe.get("results"):
-            console.print("[green]Has parsed results[/green]")
+            print(_green("Has parsed results"))
             
             # Show raw response if available
-            if vibe.get("raw_results"):
-                console.print("\n[bold]Raw Claude Response:[/bold]")
-                console.print(f"[dim]{vibe['raw_results'][:500]}{'...' if len(vibe['raw_results']) > 500 else ''}[/dim]")
+            preview, truncated = read_raw_preview(vibe, 500)
+            if preview:
+                print("\n" + _bold("Raw Claude Response:"))
+                suffix = "..." if truncated else ""
+                print(_dim(f"{preview}{suffix}"))
             
             # Show parsed BibTeX
-            console.print("\n[bold]Parsed BibTeX:[/bold]")
-            bibtex_entries = extract_bibtex_from_response(vibe.get("raw_results", ""))
+            print("\n" + _bold("Parsed BibTeX:"))
+            bibtex_entries = vibe.get("bibtex_list")
+            if bibtex_entries is None:
+                # State written before parsed entries were persisted
+                bibtex_entries = extract_bibtex_from_response(load_raw_results(vibe))
             if bibtex_entries:
                 for j, entry in enumerate(bibtex_entries):
-                    console.print(entry)
+                    print(entry)
             else:
-                console.print("[yellow]No BibTeX entries found in response[/yellow]")
-                console.print(f"[dim]{vibe['results'][:200]}{'...' if len(vibe['results']) > 200 else ''}[/dim]")
+                print(_yellow("No BibTeX entries found in response"))
+                results = vibe["results"]
+                suffix = "..." if len(results) > 200 else ""
+                print(_dim(f"{results[:200]}{suffix}"))
         else:
-            console.print("[red]No results yet[/red]")
+            print(_red("No results yet"))
 
 
-@app.command()
 def clear() -> None:
     """Clear current session."""
-    if STATE_FILE.exists():
-        STATE_FILE.unlink()
-    console.print("[green]Session cleared[/green]")
+    _state_file().unlink(missing_ok=True)
+    shutil.rmtree(_raw_cache_dir(), ignore_errors=True)
+    print(_green("Session cleared"))
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="vc",
+        description="Turn natural-language paper descriptions into curated citations",
+    )
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+    
+    init_parser = commands.add_parser("init", help="Initialize or continue a bibliography project.")
+    init_parser.add_argument("--bib", help="BibTeX file path")
+    init_parser.set_defaults(func=init)
+    
+    add_parser = commands.add_parser(
+        "add",
+        help="Add a paper vibe (natural language description).",
+        usage='vc add -- "description of papers you want"',
+    )
+    add_parser.add_argument("description", nargs=argparse.REMAINDER, help="Paper description")
+    add_parser.set_defaults(func=add)
+    
+    search_parser = commands.add_parser("search", help="Search for papers using Claude Code.")
+    search_parser.set_defaults(func=search)
+    
+    export_parser = commands.add_parser("export", help="Export collected citations.")
+    export_parser.add_argument("--bib", help="Output BibTeX file")
+    export_parser.add_argument(
+        "--format", default="bibtex", help="Output format (bibtex only for now)"
+    )
+    export_parser.set_defaults(func=export)
+    
+    ls_parser = commands.add_parser("ls", help="Show currently recorded status.")
+    ls_parser.set_defaults(func=ls)
+    
+    clear_parser = commands.add_parser("clear", help="Clear current session.")
+    clear_parser.set_defaults(func=clear)
+    
+    return parser
+
+
+def app(argv: Optional[List[str]] = None) -> None:
+    """Entry point for the ``vc`` command."""
+    parser = _build_parser()
+    namespace, extras = parser.parse_known_args(argv)
+    args = vars(namespace)
+    args.pop("command")
+    func = args.pop("func", None)
+    if func is None:
+        parser.print_help()
+        return
+    if extras:
+        if func is not add:
+            parser.error(f"unrecognized arguments: {' '.join(extras)}")
+        # Dash-prefixed words before the description (e.g. "vc add -x foo") are
+        # left unparsed by argparse; they always precede the remainder
+        args["description"] = extras + args["description"]
+    func(**args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,112 @@
+import re
+
+import pytest
+
+from vibecite.cli import assign_batch_entries, extract_bibtex_from_response
+
+# The pattern extract_bibtex_from_response originally used
+_BASELINE_BIBTEX_RE = re.compile(r'```(?:bibtex)?\s*\n(.*?)\n```', re.DOTALL | re.IGNORECASE)
+
+
+def baseline_extract(response):
+    matches = (match.strip() for match in _BASELINE_BIBTEX_RE.findall(response))
+    return [match for match in matches if match and '@' in match]
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        "```bibtex\n@a{x}\n```",
+        "Sure:\n```bibtex\n@a{x,\n  title={T}\n}\n```\nDone.",
+        "```BibTeX\n@a{x}\n```",
+        "```\n@a{x}\n```",
+        "```bibtex\n@a{x}\n```\n```bibtex\n@b{y}\n```",
+        "```bibtex\nno entry here\n```",
+        "Here it is: ```bibtex\n@a{x}\n```",
+        "```bibtex\n@a{x}\n``` done",
+        "pre ```bibtex\n@a{x}\n```\nmid\n```bibtex\n@b{y}\n``` post",
+        "```bibtex \n@a{x}\n```",
+        "```bibtex\n@a{x}",
+        "```bibtex @a{x}\n```",
+        "no code blocks at all",
+    ],
+)
+def test_extract_bibtex_matches_baseline(response):
+    assert extract_bibtex_from_response(response) == baseline_extract(response)
+    assert extract_bibtex_from_response(response.encode()) == baseline_extract(response)
+
+
+def test_extract_bibtex_skips_other_language_blocks():
+    # The original pattern read the python block's closing fence as an opening one
+    response = "```python\nprint('x')\n```\n```bibtex\n@a{x}\n```"
+    assert extract_bibtex_from_response(response) == ["@a{x}"]
+
+
+def test_extract_bibtex_closing_fence_with_trailing_text_does_not_swallow_prose():
+    response = "```bibtex\n@a{x}\n``` that was it\nprose @ here\n```bibtex\n@b{y}\n```"
+    assert extract_bibtex_from_response(response) == ["@a{x}", "@b{y}"]
+
+
+def test_assign_batch_entries_headed_answers():
+    response = (
+        b"### VIBE 1\n```bibtex\n@a{1}\n```\n"
+        b"### VIBE 2\n```bibtex\n@a{2}\n```\n"
+    )
+    assigned = assign_batch_entries(response, 2)
+    assert [entries for _, entries in assigned] == [["@a{1}"], ["@a{2}"]]
+
+
+def test_assign_batch_entries_restated_headers_then_unheaded_blocks():
+    # Claude restates the list up front, then answers without repeating headers
+    response = (
+        b"I will search for:\n"
+        b"### VIBE 1: attention\n"
+        b"### VIBE 2: bert\n"
+        b"### VIBE 3: gpt\n\n"
+        b"```bibtex\n@a{1}\n```\n"
+        b"```bibtex\n@a{2}\n```\n"
+        b"```bibtex\n@a{3}\n```\n"
+    )
+    assigned = assign_batch_entries(response, 3)
+    assert [entries for _, entries in assigned] == [["@a{1}"], ["@a{2}"], ["@a{3}"]]
+
+
+def test_assign_batch_entries_rejects_section_with_several_entries():
+    response = (
+        b"### VIBE 1: attention\n### VIBE 2: bert\n\n"
+        b"### VIBE 1\nnothing found\n"
+        b"### VIBE 2\n```bibtex\n@a{1}\n```\n```bibtex\n@a{2}\n```\n```bibtex\n@a{3}\n```\n"
+    )
+    assigned = assign_batch_entries(response, 2)
+    assert [entries for _, entries in assigned] == [[], []]
+
+
+def test_assign_batch_entries_keeps_good_sections_when_others_miss():
+    response = (
+        b"### VIBE 1\n```bibtex\n@a{1}\n```\n"
+        b"### VIBE 2\nCould not find it.\n"
+    )
+    assigned = assign_batch_entries(response, 2)
+    assert [entries for _, entries in assigned] == [["@a{1}"], []]
+
+
+def test_assign_batch_entries_without_headers():
+    response = b"```bibtex\n@a{1}\n```\n```bibtex\n@a{2}\n```\n"
+    assigned = assign_batch_entries(response, 2)
+    assert [entries for _, entries in assigned] == [["@a{1}"], ["@a{2}"]]
+
+
+def test_assign_batch_entries_does_not_cache_full_response():
+    from vibecite.cli import _extract_bibtex_cached
+
+    response = (
+        b"### VIBE 1: attention\n"
+        b"### VIBE 2: bert\n\n"
+        b"```bibtex\n@a{1}\n```\n"
+        b"```bibtex\n@a{2}\n```\n"
+    )
+    _extract_bibtex_cached.cache_clear()
+    assigned = assign_batch_entries(response, 2)
+    assert [entries for _, entries in assigned] == [["@a{1}"], ["@a{2}"]]
+    # Only the two per-vibe sections are memoized, not the whole batch response
+    assert _extract_bibtex_cached.cache_info().currsize == 2